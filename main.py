@@ -1,96 +1,350 @@
 import re # regex used for reading file
+import io # used to feed file sections to numpy's parser
 import numpy as np # numpy used for array handling
 from tqdm import tqdm # tqdm used for progress bar
-import matplotlib.pyplot as plt # used to produce graphs from results
+import matplotlib # used to produce graphs from results
+matplotlib.use('Agg') # non-interactive backend so worker processes can render figures
+import matplotlib.pyplot as plt
 import os # used to create results folder if it doesn't exist
+import multiprocessing # used to run ants in parallel across processes
+
+# numba (optional) used to compile hot numeric kernels
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    prange = range
+    NUMBA_AVAILABLE = False
+
+def _fitness(distance_matrix, flow_matrix, path_index) -> int:
+    '''
+    Fitness kernel written as explicit loops so numba can compile it.
+    Takes the 0-indexed permutation so no per-element subtraction happens
+    in the inner loop, and avoids the temporary n x n gather the einsum
+    fallback allocates.
+    '''
+    fitness = 0
+    n = path_index.shape[0]
+    for i in range(n):
+        row = path_index[i]
+        for j in range(n):
+            fitness += distance_matrix[i, j] * flow_matrix[row, path_index[j]]
+    return fitness
+
+def _simulateGeneration(pheromone_matrix, heuristic_matrix, distance_matrix, flow_matrix, seeds) -> tuple:
+    '''
+    Constructs one full generation of ants, compiled with numba when available.
+    Each ant builds its path and evaluates its fitness independently, so the
+    ant loop runs across threads via prange with no shared writes.
+    Returns (paths, fitnesses) for the generation.
+    '''
+    number_of_ants = seeds.shape[0]
+    number_of_nodes = distance_matrix.shape[0]
+    paths = np.empty((number_of_ants, number_of_nodes), dtype=np.int64)
+    fitnesses = np.empty(number_of_ants, dtype=np.int64)
+
+    for ant in prange(number_of_ants):
+        # seed the (thread-local) generator so each ant explores a different path
+        np.random.seed(seeds[ant])
+
+        # visited set packed into a single integer bitmask - bit k set means node k may
+        # still be chosen, initially all nodes apart from the starting node (fits in an
+        # int64 for n <= 62, which run() guards before dispatching here)
+        allowed_bits = (1 << (number_of_nodes + 1)) - 2
+
+        # scratch cumulative-weightings buffer reused by every step of this ant's path
+        cumulative_weightings = np.empty(number_of_nodes + 1)
+
+        current_node = 0
+        for step in range(number_of_nodes):
+            pheromone_row = pheromone_matrix[current_node]
+            heuristic_row = heuristic_matrix[current_node]
+
+            # build the cumulative weightings in a single pass, masking visited nodes
+            # with a bit test instead of a float multiply
+            total = 0.0
+            for node in range(number_of_nodes + 1):
+                if (allowed_bits >> node) & 1:
+                    total += pheromone_row[node] * heuristic_row[node]
+                cumulative_weightings[node] = total
+
+            # sample via inverse-CDF; visited nodes repeat the previous cumulative value
+            # so side='right' can never land on them
+            next_node = np.searchsorted(cumulative_weightings, np.random.random() * total, side='right')
+
+            paths[ant, step] = next_node
+            allowed_bits &= ~(1 << next_node)
+            current_node = next_node
+
+        fitnesses[ant] = _fitness(distance_matrix, flow_matrix, paths[ant] - 1)
+
+    return paths, fitnesses
+
+if NUMBA_AVAILABLE:
+    _fitness = njit(cache=True)(_fitness)
+    _simulateGeneration = njit(cache=True, parallel=True)(_simulateGeneration)
 
 class AntColony:
     def __init__(self, number_of_ants: int, evaporation_rate: float, data: tuple[int, list[list[int], list[list[int]]]]) -> None:
         self.number_of_ants = number_of_ants
         self.evaporation_rate = evaporation_rate
-        self.number_of_nodes, self.distance_matrix, self.flow_matrix = data
+        self.number_of_nodes, distance_matrix, flow_matrix = data
+
+        # store matrices as contiguous numpy arrays so fitness can be computed vectorised
+        self.distance_matrix = np.asarray(distance_matrix, dtype=np.int64)
+        self.flow_matrix = np.asarray(flow_matrix, dtype=np.int64)
+
+        # warm up the jitted fitness kernel once so compilation doesn't land mid-simulation
+        if NUMBA_AVAILABLE:
+            _fitness(self.distance_matrix, self.flow_matrix, np.arange(self.number_of_nodes, dtype=np.int64))
+
+        # PCG64 generator - faster than the legacy global MT19937 and safely
+        # instantiable per ant/worker rather than sharing locked global state
+        self.rng = np.random.default_rng()
+
+        # initalise pheromone matrix as a single 2-D float32 array - single precision is
+        # ample for pheromone levels and halves the bytes moved by every row read,
+        # cumulative sum and evaporation pass
+        self.pheromone_matrix = self.rng.random((self.number_of_nodes + 1, self.number_of_nodes + 1), dtype=np.float32)
+        np.fill_diagonal(self.pheromone_matrix, 0.0)
 
-        # initalise pheromone matrix
-        self.pheromone_matrix = [[np.random.random() if i != j else 0 for j in range(self.number_of_nodes + 1)] for i in range(self.number_of_nodes + 1)]
+        # precompute heuristic matrix (eta = 1/distance) once rather than per choice;
+        # the virtual start node 0 gets a neutral weighting of 1 and zero distances are
+        # clamped to 1 so no unvisited node can ever end up with zero weight
+        self.heuristic_matrix = np.ones((self.number_of_nodes + 1, self.number_of_nodes + 1), dtype=np.float32)
+        self.heuristic_matrix[1:, 1:] = 1.0 / np.maximum(self.distance_matrix, 1)
+
+        # cached weightings row for the first step of a path, see startWeightings
+        self._start_weightings = None
+
+        # buffer the ants' pheromone deposits are accumulated into, merged into the
+        # pheromone matrix once per generation rather than ant by ant
+        self.deposit_buffer = np.zeros_like(self.pheromone_matrix)
     
-    def run(self, fitness_evaluations: int = 10_000) -> None:
+    def run(self, fitness_evaluations: int = 10_000, processes: int = None) -> None:
         '''
         Runs the simulation until the provided number of fitness evaluations have been reached (default 10,000).
+        If processes is greater than 1, each generation of ants is simulated in parallel across that many worker processes.
         '''
         # initalise all ants
         ants = [Ant(self) for _ in range(self.number_of_ants)]
-        
+
         # initalise variables to store 'best' solution
         self.best_fitness = None
         best_path = None
 
         # initalise array to store results
         self.results = []
-        
+
+        if processes is not None and processes > 1:
+            best_path = self.runParallel(fitness_evaluations, processes, ants)
+        elif NUMBA_AVAILABLE and self.number_of_nodes <= 62:
+            # the compiled kernel packs its visited set into an int64 bitmask, so larger
+            # instances fall back to the Python loop below
+            best_path = self.runCompiled(fitness_evaluations, ants)
+        else:
+            # initalise progress bar to track simulations
+            progress_bar = tqdm(range(fitness_evaluations), f'Running simulation (m={self.number_of_ants}, e={self.evaporation_rate})', mininterval=0.5)
+
+            ant_number = 0
+            for i in progress_bar:
+                path = ants[ant_number].calculatePath()
+                fitness = ants[ant_number].calculatePathFitness()
+                if self.best_fitness is None or fitness < self.best_fitness:
+                    self.best_fitness = fitness
+                    best_path = path.copy() # the ant's path buffer is reused next iteration
+                self.results.append(fitness)
+
+                # update pheromones when all ants have completed fitness evaluations
+                if ant_number > self.number_of_ants - 2:
+                    for ant in ants:
+                        ant.updatePheromones()
+                    self.depositPheromones()
+                    ant_number = 0
+                    self.evaporatePheromones()
+
+                ant_number += 1
+
+        # output results once simulation complete
+        print(f'Simulation complete.\nBest fitness: {self.best_fitness:,d}\nPath: {best_path.tolist()}\n')
+
+    def runCompiled(self, fitness_evaluations: int, ants: list) -> np.ndarray:
+        '''
+        Runs the generation loop through the numba-compiled kernel, which constructs
+        all ants of a generation in parallel threads. Python-level work per generation
+        is reduced to bookkeeping and the pheromone update.
+        '''
+        best_path = None
+
         # initalise progress bar to track simulations
-        progress_bar = tqdm(range(fitness_evaluations), f'Running simulation (m={self.number_of_ants}, e={self.evaporation_rate})')
-
-        ant_number = 0
-        for i in progress_bar:
-            path = ants[ant_number].calculatePath()
-            fitness = ants[ant_number].calculatePathFitness()
-            if self.best_fitness is None or fitness < self.best_fitness:
-                self.best_fitness = fitness
-                best_path = path
-            self.results.append(fitness)
-            
+        progress_bar = tqdm(total=fitness_evaluations, desc=f'Running simulation (m={self.number_of_ants}, e={self.evaporation_rate})', mininterval=0.5)
+
+        evaluations = 0
+        while evaluations < fitness_evaluations:
+            generation_size = min(self.number_of_ants, fitness_evaluations - evaluations)
+
+            # construct and evaluate the whole generation in compiled code
+            seeds = self.rng.integers(2 ** 31 - 1, size=generation_size)
+            paths, fitnesses = _simulateGeneration(self.pheromone_matrix, self.heuristic_matrix, self.distance_matrix, self.flow_matrix, seeds)
+
+            for ant, path, fitness in zip(ants, paths, fitnesses):
+                ant.path = path
+                ant.fitness = int(fitness)
+                if self.best_fitness is None or ant.fitness < self.best_fitness:
+                    self.best_fitness = ant.fitness
+                    best_path = path
+                self.results.append(ant.fitness)
+
             # update pheromones when all ants have completed fitness evaluations
-            if ant_number > self.number_of_ants - 2:
+            if generation_size == self.number_of_ants:
                 for ant in ants:
                     ant.updatePheromones()
-                ant_number = 0
-                self.evaporatePheromones
-            
-            ant_number += 1
+                self.depositPheromones()
+                self.evaporatePheromones()
 
-        # output results once simulation complete
-        print(f'Simulation complete.\nBest fitness: {self.best_fitness:,d}\nPath: {best_path}\n')           
+            evaluations += generation_size
+            progress_bar.update(generation_size)
+
+        progress_bar.close()
+        return best_path
+
+    def runParallel(self, fitness_evaluations: int, processes: int, ants: list) -> np.ndarray:
+        '''
+        Simulates each generation of ants concurrently in a process pool ('parallel ants' strategy).
+        Workers only construct paths and evaluate fitness; pheromone updates are applied sequentially on the master.
+        '''
+        data = (self.number_of_nodes, self.distance_matrix, self.flow_matrix)
+        best_path = None
+
+        # initalise progress bar to track simulations
+        progress_bar = tqdm(total=fitness_evaluations, desc=f'Running simulation (m={self.number_of_ants}, e={self.evaporation_rate})', mininterval=0.5)
+
+        with multiprocessing.Pool(processes, initializer=_initialiseWorker, initargs=(data,)) as pool:
+            evaluations = 0
+            while evaluations < fitness_evaluations:
+                generation_size = min(self.number_of_ants, fitness_evaluations - evaluations)
+
+                # give each worker an independent seed so ants explore different paths
+                seeds = [int(seed) for seed in self.rng.integers(2 ** 31 - 1, size=generation_size)]
+                results = pool.starmap(_simulateAnt, [(self.pheromone_matrix, seed) for seed in seeds])
+
+                for ant, (path, fitness) in zip(ants, results):
+                    ant.path = path
+                    ant.fitness = fitness
+                    if self.best_fitness is None or fitness < self.best_fitness:
+                        self.best_fitness = fitness
+                        best_path = path
+                    self.results.append(fitness)
+
+                # update pheromones when all ants have completed fitness evaluations
+                if generation_size == self.number_of_ants:
+                    for ant in ants:
+                        ant.updatePheromones()
+                    self.depositPheromones()
+                    self.evaporatePheromones()
+
+                evaluations += generation_size
+                progress_bar.update(generation_size)
+
+        progress_bar.close()
+        return best_path
             
     def evaporatePheromones(self) -> None:
         '''
         Multiplies all values in the pheromone matrix by the evaporation rate to simulate pheromone evaporation/decay.
         '''
-        self.pheromone_matrix = np.multiply(self.pheromone_matrix, self.evaporation_rate)
+        self.pheromone_matrix *= self.evaporation_rate
+        self._start_weightings = None
+
+    def depositPheromones(self) -> None:
+        '''
+        Merges the deposits accumulated by this generation's ants into the pheromone
+        matrix in one pass and clears the buffer for the next generation.
+        '''
+        self.pheromone_matrix += self.deposit_buffer
+        self.deposit_buffer.fill(0.0)
+        self._start_weightings = None
+
+    def startWeightings(self) -> np.ndarray:
+        '''
+        Weightings row for the first step of a path (from the virtual start node, with
+        only that node disallowed). Identical for every ant until the pheromone matrix
+        changes, so it is cached here and invalidated on every pheromone update.
+        '''
+        if self._start_weightings is None:
+            self._start_weightings = self.pheromone_matrix[0] * self.heuristic_matrix[0]
+            self._start_weightings[0] = 0.0
+        return self._start_weightings
 
 class Ant:
-    def __init__(self, colony: AntColony):
+    def __init__(self, colony: AntColony, seed: int = None):
         self.colony = colony
 
-    def calculatePath(self) -> list:
+        # each ant owns its own generator so sampling never contends on global state
+        self.rng = np.random.default_rng(seed)
+
+        # preallocated buffers reused by every path this ant constructs, so path
+        # construction allocates nothing across the whole simulation
+        number_of_nodes = colony.number_of_nodes
+        self.allowed_nodes = np.empty(number_of_nodes + 1, dtype=np.float32)
+        self.weightings_buffer = np.empty(number_of_nodes + 1, dtype=np.float32)
+        self.cumulative_buffer = np.empty(number_of_nodes + 1, dtype=np.float64)
+        self.path_buffer = np.empty(number_of_nodes, dtype=np.int64)
+        self.path_index_buffer = np.empty(number_of_nodes, dtype=np.int64)
+        self.source_buffer = np.empty(number_of_nodes, dtype=np.int64)
+
+        # n x n scratch buffers for the fitness fallback's flow gather - only needed
+        # when the compiled kernel isn't handling fitness
+        if not NUMBA_AVAILABLE:
+            self.gather_buffer = np.empty((number_of_nodes, number_of_nodes), dtype=np.int64)
+            self.permuted_flow_buffer = np.empty((number_of_nodes, number_of_nodes), dtype=np.int64)
+
+    def calculatePath(self) -> np.ndarray:
         '''
         Generate a permutation.
         '''
         self.current_node = 0
 
-        # initialise allowed nodes matrix, start with all allowed apart from starting node
-        self.allowed_nodes = [1 if i != 0 else 0 for i in range(self.colony.number_of_nodes + 1)]
+        # reset allowed nodes mask, start with all allowed apart from starting node
+        self.allowed_nodes.fill(1.0)
+        self.allowed_nodes[0] = 0.0
+        self.path_length = 0
 
         # iteratively choose next node to generate permutation
-        self.path = []
         for i in range(self.colony.number_of_nodes):
             self.chooseNextNode()
+
+        # expose the finished permutation and its 0-indexed form (so fitness never
+        # re-subtracts per element) through the reused buffers - no new arrays
+        self.path = self.path_buffer
+        np.subtract(self.path_buffer, 1, out=self.path_index_buffer)
+        self.path_index = self.path_index_buffer
         return self.path
 
     def chooseNextNode(self) -> None:
         '''
         Chooses next node randomly, with bias towards nodes with more pheromone.
         '''
-        # calculate node weightings with current pheromone matrix, remove nodes that have already been visited
-        next_node_weightings = np.multiply([i for i in self.colony.pheromone_matrix[self.current_node]], self.allowed_nodes)
+        # calculate node weightings from pheromone and the precomputed heuristic, remove nodes
+        # that have already been visited - all in the reused scratch buffer, no temporaries
+        next_node_weightings = self.weightings_buffer
+        if self.current_node == 0:
+            # first step: nothing visited yet, so the masked row is the colony-wide cached one
+            next_node_weightings[:] = self.colony.startWeightings()
+        else:
+            np.multiply(self.colony.pheromone_matrix[self.current_node], self.colony.heuristic_matrix[self.current_node], out=next_node_weightings)
+            next_node_weightings *= self.allowed_nodes
 
-        # convert weightings to probabilities
-        next_node_probabilities = np.array(next_node_weightings) / np.sum(next_node_weightings)
-
-        # choose next node randomly with bias based on probabilites
-        next_node = np.random.choice(self.colony.number_of_nodes + 1, p = next_node_probabilities)
+        # choose next node randomly with bias based on weightings via inverse-CDF sampling
+        # (avoids np.random.choice's probability validation and normalisation overhead);
+        # the cumulative sum and draw stay in float64 - in float32 a draw close enough to
+        # 1 rounds up to exactly the total and searchsorted runs off the end of the row
+        np.cumsum(next_node_weightings, dtype=np.float64, out=self.cumulative_buffer)
+        next_node = int(np.searchsorted(self.cumulative_buffer, self.rng.random() * self.cumulative_buffer[-1], side='right'))
 
         # add chosen node to solution
-        self.path.append(next_node)
+        self.path_buffer[self.path_length] = next_node
+        self.path_length += 1
 
         # remove node from allowed nodes as to not be visited again
         self.allowed_nodes[next_node] = 0
@@ -103,25 +357,79 @@ class Ant:
         Calculates the fitness of a generated permutation.
         Note that lower fitness is better in this case.
         '''
-        self.fitness = 0
-        
-        # sum cost from each facility to every other facility to calculate fitness
-        for i in range(len(self.path)):
-            for j in range(len(self.path)):
-                self.fitness += self.colony.distance_matrix[i][j] * self.colony.flow_matrix[self.path[i] - 1][self.path[j] - 1]
+        # prefer the compiled kernel - no temporary arrays, just one pass over n^2 ints
+        if NUMBA_AVAILABLE:
+            self.fitness = int(_fitness(self.colony.distance_matrix, self.colony.flow_matrix, self.path_index))
+            return self.fitness
+
+        # gather the flow matrix permuted by the path with per-axis takes into reused
+        # buffers - no fancy-index intermediates, and mode='clip' skips bounds checking
+        self.colony.flow_matrix.take(self.path_index, axis=0, out=self.gather_buffer, mode='clip')
+        self.gather_buffer.take(self.path_index, axis=1, out=self.permuted_flow_buffer, mode='clip')
+
+        # sum cost from each facility to every other facility in one vectorised reduction
+        np.multiply(self.colony.distance_matrix, self.permuted_flow_buffer, out=self.gather_buffer)
+        self.fitness = int(self.gather_buffer.sum())
         return self.fitness
 
     def updatePheromones(self) -> None:
         '''
-        Updates the global pheromone matrix with values proportionate to fitness of the ant's generated permutation.
+        Scatters pheromone proportionate to the fitness of the ant's generated permutation
+        into the colony's deposit buffer, which depositPheromones merges into the pheromone
+        matrix once the whole generation has deposited.
         '''
         # calculate pheromone amount - less fitness is better
         pheromone_amount = 1 / self.fitness
 
-        # add pheromone to pheromone matrix
-        self.colony.pheromone_matrix[0][self.path[0]] += pheromone_amount
-        for i in range(0, len(self.path) - 1):
-            self.colony.pheromone_matrix[self.path[i]][self.path[i+1]] += pheromone_amount
+        # add pheromone for every traversed edge (0 -> path[0] -> ... -> path[-1]) to the
+        # colony's deposit buffer in one vectorised scatter; the buffer is merged into the
+        # pheromone matrix once the whole generation has deposited
+        source_nodes = self.source_buffer
+        source_nodes[0] = 0
+        source_nodes[1:] = self.path[:-1]
+        np.add.at(self.colony.deposit_buffer, (source_nodes, self.path), pheromone_amount)
+
+# ant replica owned by each worker process, created once per worker by _initialiseWorker
+_worker_ant = None
+
+def _initialiseWorker(data: tuple) -> None:
+    '''
+    Builds a colony replica in a worker process so each parallel ant simulation
+    only needs the current pheromone matrix sending to it.
+    '''
+    global _worker_ant
+    _worker_ant = Ant(AntColony(1, 0.0, data))
+
+def _simulateAnt(pheromone_matrix: np.ndarray, seed: int) -> tuple:
+    '''
+    Constructs a single ant's path against the given pheromone matrix and
+    returns (path, fitness). Pure worker-side function - no shared state is written.
+    '''
+    _worker_ant.rng = np.random.default_rng(seed)
+    _worker_ant.colony.pheromone_matrix = pheromone_matrix
+    _worker_ant.colony._start_weightings = None
+    path = _worker_ant.calculatePath()
+    fitness = _worker_ant.calculatePathFitness()
+    return path, fitness
+
+def runExperiment(experiment: tuple) -> None:
+    '''
+    Runs one replicate of a (number_of_ants, evaporation_rate) configuration and
+    saves its fitness graph - a single task of the experiment sweep in __main__,
+    so independent replicates can be dispatched across worker processes.
+    '''
+    (number_of_ants, evaporation_rate), replicate, data = experiment
+    colony = AntColony(number_of_ants, evaporation_rate, data)
+    colony.run()
+
+    # plot results with matplotlib.pyplot
+    figure = plt.figure()
+    plt.plot(colony.results)
+    plt.title(f'm = {number_of_ants}, e = {evaporation_rate}')
+    plt.suptitle(f'Best fitness: {colony.best_fitness:,d}')
+    plt.xlabel("Iteration"); plt.ylabel("Fitness")
+    figure.savefig(fname=f'results/m{number_of_ants}_e{evaporation_rate}_{replicate}.png')
+    plt.close(figure)
 
 class FileReader:
     '''
@@ -137,13 +445,13 @@ class FileReader:
             # read number of facilities
             self.number_of_nodes = int(data[0])
 
-            # read distance matrix
-            self.distance_matrix = [[int(y) for y in x.split()] for x in data[1].split("\n")]
+            # read distance matrix (parsed in C by numpy, straight into a contiguous array)
+            self.distance_matrix = np.loadtxt(io.StringIO(data[1]), dtype=np.int64)
 
             # read flow matrix
-            self.flow_matrix = [[int(y) for y in x.split()] for x in data[2].split("\n")]
-    
-    def getData(self) -> tuple[int, list[list[int]], list[list[int]]]:
+            self.flow_matrix = np.loadtxt(io.StringIO(data[2]), dtype=np.int64)
+
+    def getData(self) -> tuple[int, np.ndarray, np.ndarray]:
         '''
         Returns all values and matrices in a tuple:\n
         (Number of nodes, Distance matrix, Flow matrix)
@@ -161,16 +469,7 @@ if __name__ == "__main__":
     # list of simluations to run (m, e)
     tests = [(100, 0.9)]
 
-    for test in tests:
-        # run each simulation 5 times
-        for i in range(5):
-            colony = AntColony(test[0], test[1], file_data)
-            colony.run()
-            
-            # plot results with matplotlib.pyplot
-            figure = plt.figure()
-            plt.plot(colony.results)
-            plt.title(f'm = {test[0]}, e = {test[1]}')
-            plt.suptitle(f'Best fitness: {colony.best_fitness:,d}')
-            plt.xlabel("Iteration"); plt.ylabel("Fitness")
-            figure.savefig(fname=f'results/m{test[0]}_e{test[1]}_{i}.png')
\ No newline at end of file
+    # run each simulation 5 times, with independent replicates dispatched in parallel
+    experiments = [(test, i, file_data) for test in tests for i in range(5)]
+    with multiprocessing.Pool(min(os.cpu_count(), len(experiments))) as pool:
+        pool.map(runExperiment, experiments)
\ No newline at end of file